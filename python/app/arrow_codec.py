@@ -0,0 +1,17 @@
+"""
+Arrow IPC 编码，供 main 的进程池调用
+
+单独成模块: forkserver 子进程反序列化任务时只需导入本模块 (pandas + pyarrow)，
+不会重新导入 main 及其依赖的 FastAPI、ashare_core
+"""
+import pandas as pd
+import pyarrow as pa
+
+
+def df_to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """将 DataFrame 编码为 Arrow IPC stream，列数据按缓冲区整体写出"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -1,120 +1,591 @@
-from typing import AsyncGenerator, Literal, Any
-from fastapi import FastAPI, Request, Depends
+from typing import Annotated, AsyncGenerator, Callable, Final, Iterator, Literal, Any
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 
+import os
 import time
-import redis
-import mysql.connector
+import base64
+import asyncio
+import multiprocessing
+import hashlib
+import orjson
+import msgspec
+import requests
+import aiomysql
+import numpy as np
+import pandas as pd
+from redis import asyncio as aioredis
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
 from os import environ
+from functools import partial, wraps
+from datetime import timedelta
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
 
 from ashare_core.crawler import em_web, ths_web, ths_app, jyhf_app, jygs_web
 from ashare_core.tool import SessionManager
 
+from arrow_codec import df_to_arrow_ipc
+
 
 # =========================== 定义数据模型 ============================
-...
+class CrawlResponse(msgspec.Struct, kw_only=True, omit_defaults=True):
+    """爬虫端点的响应结构，未提供的 symbol / id / size / next_cursor 不输出"""
+    result: dict[str, Any]
+    symbol: str | None = None
+    id: str | None = None
+    size: int | None = None
+    next_cursor: str | None = None
+    status: str
+    timestamp: int
+
+
+# ============================ 参数映射 ============================
+_PERIOD_MAP: Final[dict[str, str]] = {
+    'daily': '日线',
+    'weekly': '周线',
+    'monthly': '月线',
+    'quarterly': '季线',
+    'yearly': '年线',
+    '1min': '1分钟线',
+    '5min': '5分钟线',
+    '30min': '30分钟线',
+    '60min': '60分钟线',
+    '240min': '240分钟线'
+}
+_FQ_MAP: Final[dict[str, str]] = {
+    'bfq': '不复权',
+    'qfq': '前复权',
+    'hfq': '后复权'
+}
+_PLATE_TYPE_MAP: Final[dict[str, str]] = {
+    'concept': '概念',
+    'industry': '行业',
+    'region': '地域',
+    'style': '风格'
+}
+
+
+# ============================ 序列化工具 ============================
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+ARROW_MEDIA_TYPE: Final = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE: Final = "application/x-ndjson"
+# 超过该行数的 DataFrame 交给进程池序列化，避免长时间占用 GIL
+_OFFLOAD_ROWS: Final = 500
+# 同一容器内的 uvicorn worker 数，进程池按此均分 CPU
+_WEB_CONCURRENCY: Final = max(1, int(environ.get("WEB_CONCURRENCY", 1)))
+
+
+def _json_default(obj: Any) -> Any:
+    # orjson 不认识的 pandas / numpy 标量
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    # 与原 jsonable_encoder 的输出保持一致: 时间差为秒数，Decimal 为数值
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (np.datetime64, np.timedelta64)):
+        if np.isnat(obj):
+            return None
+        if isinstance(obj, np.datetime64):
+            return pd.Timestamp(obj).isoformat()
+        return pd.Timedelta(obj).total_seconds()
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.is_finite() and obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def normalize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    装着 numpy 标量的 object 列在编码时每个单元格都要经过 enc_hook，
+    先推断为 float64 / int64 等原生 dtype；其余列 (含 Python 原生对象) 保持不变
+    推断会改变标量类型的列 (如含 None 的整数列被提升为 float64) 不转换
+    """
+    converted = {}
+    for i, dtype in enumerate(df.dtypes):
+        if dtype != object:
+            continue
+        col = df.iloc[:, i]
+        if col.empty:
+            continue
+        # 以第一个非空值作样本，首行为空时才扫描整列
+        sample = col.iat[0]
+        if pd.api.types.is_scalar(sample) and pd.isna(sample):
+            valid = col.notna().to_numpy()
+            if not valid.any():
+                continue
+            sample = col.iat[int(valid.argmax())]
+        if not isinstance(sample, np.generic):
+            continue
+        inferred = col.infer_objects()
+        if inferred.dtype.kind == sample.dtype.kind:
+            converted[i] = inferred
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df
+
+
+def _column_tolist(col: pd.Series) -> list:
+    # numpy 原生 dtype 直接 ndarray.tolist()；datetime 与 Int64 等扩展 dtype 交给 pandas 装箱，
+    # 否则含 NA 的 Int64 经 to_numpy() 会变成 float64
+    if isinstance(col.dtype, np.dtype) and col.dtype.kind in "biufO":
+        return col.to_numpy().tolist()
+    return col.tolist()
+
+
+def df_to_split(df: pd.DataFrame) -> dict[str, list]:
+    """
+    等价于 df.to_dict("split")，但按列 tolist 后再转置为行，
+    跳过 pandas 逐个单元格的 maybe_box_native 以及 object 行数组的构造
+    """
+    df = normalize_dtypes(df)
+    columns = [_column_tolist(df.iloc[:, i]) for i in range(df.shape[1])]
+    if columns:
+        data = [list(row) for row in zip(*columns)]
+    else:
+        data = [[] for _ in range(df.shape[0])]
+    return {
+        "columns": df.columns.tolist(),
+        "index": df.index.tolist(),
+        "data": data
+    }
+
+
+def accepts_arrow(request: Request) -> bool:
+    return ARROW_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def arrow_response(request: Request, df: pd.DataFrame) -> Response:
+    if df.shape[0] > _OFFLOAD_ROWS:
+        pool: ProcessPoolExecutor = request.app.state.serialize_pool
+        # 端点运行在 anyio 线程池 (默认 40 线程)，等待期间不占用事件循环
+        body = pool.submit(df_to_arrow_ipc, df).result()
+    else:
+        body = df_to_arrow_ipc(df)
+    return Response(content=body, media_type=ARROW_MEDIA_TYPE)
+
+
+def accepts_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_rows(df: pd.DataFrame) -> Iterator[bytes]:
+    """首行为列名，其后每行一条记录，itertuples 避免构造行 Series"""
+    yield orjson.dumps({"header": {"columns": df.columns.tolist()}}) + b"\n"
+    for row in df.itertuples(index=False, name=None):
+        yield orjson.dumps(row, default=_json_default, option=_ORJSON_OPTIONS) + b"\n"
+
+
+def ndjson_response(df: pd.DataFrame) -> StreamingResponse:
+    return StreamingResponse(ndjson_rows(df), media_type=NDJSON_MEDIA_TYPE)
+
+
+class OrjsonResponse(JSONResponse):
+    """使用 orjson 渲染的 JSONResponse，作为全局默认响应类"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+_MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_json_default, decimal_format="number")
+
+
+class MsgspecResponse(Response):
+    """按 msgspec.Struct 的固定字段布局编码，绕过 FastAPI 的 jsonable_encoder"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _MSGSPEC_ENCODER.encode(content)
+
+
+# ============================ 爬虫会话 ============================
+_SESSION_TTL: Final = 3600
+# 端点使用的会话: name -> (group, cls, create_or_get 参数)
+_SESSION_SPECS: Final[dict[str, tuple[str, str, dict[str, Any]]]] = {
+    "em_guba": ("em_guba", "Session", {"use_http": False}),
+    "ths_app": ("ths_app", "Session", {}),
+    "ths_l2": ("ths_l2", "Session", {}),
+    "ths_web": ("ths_web", "Session", {}),
+    "em_web": ("em_web", "Session", {}),
+    "jygs_web": ("jygs_web", "Session", {"use_http": False}),
+    "jyhf_app": ("jyhf_app", "Session", {"use_http": False}),
+    "jyhf_app_json": ("jyhf_app", "Session", {"use_http": False, "check": "json"}),
+}
+
+
+# 每个 host 保持的长连接数，不低于 anyio 线程池的并发量 (默认 40)
+_HTTP_POOL_MAXSIZE: Final = 50
+
+
+def _widen_pool(session: Any) -> None:
+    # 会话被多个线程共享，requests 默认每个 host 只保留 10 个连接，
+    # 超出的连接用完即关，下次又要重新 TCP + TLS 握手
+    if not isinstance(session, requests.Session):
+        return
+    # 原地重建已挂载 adapter 的连接池，保留 ashare_core 可能挂载的子类
+    # (SSL / cipher 设置、自定义 send) 及其 max_retries、pool_block
+    for adapter in session.adapters.values():
+        if not isinstance(adapter, HTTPAdapter):
+            continue
+        if getattr(adapter, "_pool_maxsize", _HTTP_POOL_MAXSIZE) >= _HTTP_POOL_MAXSIZE:
+            continue
+        # init_poolmanager 直接替换 poolmanager，先关闭旧连接池中的空闲连接；
+        # 子类可能未调用 HTTPAdapter.__init__，私有属性缺失时取 requests 默认值
+        old_manager = getattr(adapter, "poolmanager", None)
+        if old_manager is not None:
+            old_manager.clear()
+        adapter.init_poolmanager(
+            getattr(adapter, "_pool_connections", DEFAULT_POOLSIZE),
+            _HTTP_POOL_MAXSIZE,
+            block=getattr(adapter, "_pool_block", DEFAULT_POOLBLOCK)
+        )
+
+
+def crawler_session(request: Request, name: str) -> Any:
+    """
+    复用 app.state.sessions 中已取得的会话，不必每次请求都经过 SessionManager
+    有效期从 SessionManager 首次交出该会话对象时开始计算，到期后重新获取；
+    若返回的仍是同一对象则沿用原时间，不会让缓存比 SessionManager 中的会话活得更久
+    """
+    sessions: dict[str, tuple[float, Any]] = request.app.state.sessions
+    now = time.monotonic()
+    entry = sessions.get(name)
+    if entry is None or now - entry[0] >= _SESSION_TTL:
+        group, cls, kwargs = _SESSION_SPECS[name]
+        session_manager: SessionManager = request.app.state.session_manager
+        session = session_manager.create_or_get(group, cls, **kwargs)
+        # 同一会话对象沿用最初取得的时间，只有新对象才重新计时并放大连接池
+        issued = next((t for t, s in sessions.values() if s is session), None)
+        if issued is None:
+            _widen_pool(session)
+            issued = now
+        entry = sessions[name] = (issued, session)
+    return entry[1]
+
+
+# ============================ 分页游标 ============================
+def _query_digest(query: dict[str, Any]) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(query, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+
+
+def encode_cursor(index: int, query: dict[str, Any]) -> str:
+    """游标绑定生成它的查询参数 (pagesize / 排序 / 日期等)，换参数后不能续用"""
+    payload = {"index": index, "query": _query_digest(query)}
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode()
+
+
+def decode_cursor(cursor: str, query: dict[str, Any]) -> int:
+    """游标对客户端不透明，内容为下一页的页码 index 及查询参数摘要"""
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor))
+        index = payload["index"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor") from None
+    if not isinstance(index, int) or index < 0:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    if payload.get("query") != _query_digest(query):
+        raise HTTPException(status_code=400, detail="cursor does not match query")
+    return index
+
 
 # ============================ 初始化服务连接 ============================
 
 
-def get_redis_client() -> redis.Redis:
-    return redis.Redis(host=environ.get('REDIS_HOST', 'redis'), port=6379, db=0)
+def get_redis_client() -> aioredis.Redis:
+    pool = aioredis.ConnectionPool(
+        host=environ.get('REDIS_HOST', 'redis'),
+        port=6379,
+        db=0,
+        max_connections=32
+    )
+    return aioredis.Redis(connection_pool=pool)
 
 
-def get_mysql_connection() -> mysql.connector.MySQLConnection:
-    max_retries = 10
-    delay = 2  # 秒
+async def get_mysql_pool(max_retries: int = 10, base_delay: float = 1) -> aiomysql.Pool:
     last_err = None
     for i in range(max_retries):
         try:
-            return mysql.connector.connect(
+            return await aiomysql.create_pool(
                 host=environ.get('MYSQL_HOST', 'mysql'),
                 port=int(environ.get("MYSQL_PORT", 3306)),
                 user=environ.get('MYSQL_USER', 'appuser'),
                 password=environ.get('MYSQL_PASSWORD', 'apppass'),
-                database=environ.get('MYSQL_DATABASE', 'appdb')
+                db=environ.get('MYSQL_DATABASE', 'appdb'),
+                minsize=1,
+                maxsize=10,
+                autocommit=True
             )
         except Exception as e:
             last_err = e
+            if i + 1 == max_retries:
+                break
+            # 指数退避: 1, 2, 4, 8... 秒，最多 30 秒
+            delay = min(base_delay * 2 ** i, 30)
             print(f"[MySQL] 第{i+1}次连接失败: {e}, {delay}s后重试...")
-            time.sleep(delay)
+            await asyncio.sleep(delay)
     raise last_err
 
 
+async def connect_mysql(app: FastAPI) -> None:
+    # 后台建立连接池，避免冷启动的数据库阻塞服务启动
+    try:
+        app.state.mysql_pool = await get_mysql_pool()
+    except Exception as e:
+        print(f"MySQL 连接失败: {e}")
+
+
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, Any]:
     # 初始化连接
     redis_client = get_redis_client()
-    mysql_conn = None
-    session_manager = SessionManager(3600)
+    session_manager = SessionManager(_SESSION_TTL)
     try:
         # 验证 Redis 连接
-        redis_client.ping()
+        await redis_client.ping()
     except Exception as e:
         print(f"Redis 连接失败: {e}")
+        await redis_client.aclose()
         redis_client = None
-    try:
-        # 验证 MySQL 连接
-        mysql_conn = get_mysql_connection()
-        if not mysql_conn.is_connected():
-            print("MySQL 连接失败")
-            mysql_conn = None
-    except Exception as e:
-        print(f"MySQL 连接失败: {e}")
-        mysql_conn = None
-    # 挂载到 app.state
+    # 挂载到 app.state，MySQL 连接池就绪前为 None
     app.state.redis_client = redis_client
-    app.state.mysql_conn = mysql_conn
+    app.state.mysql_pool = None
     app.state.session_manager = session_manager
+    app.state.sessions = {}
+    app.state.inflight = {}
+    app.state.health_cache = {
+        "ts": float("-inf"), "redis_ok": False, "mysql_ok": False}
+    # forkserver: 避免在已有线程的进程中直接 fork；预加载 arrow_codec，
+    # 子进程从已导入 pandas / pyarrow 的 forkserver 派生
+    mp_context = multiprocessing.get_context("forkserver")
+    mp_context.set_forkserver_preload(["arrow_codec"])
+    # 每个 uvicorn worker 各有一个进程池，按 WEB_CONCURRENCY 均分 CPU
+    app.state.serialize_pool = ProcessPoolExecutor(
+        max_workers=max(1, (os.cpu_count() or 1) // _WEB_CONCURRENCY),
+        mp_context=mp_context
+    )
+    mysql_task = asyncio.create_task(connect_mysql(app))
     yield
+    mysql_task.cancel()
+    app.state.serialize_pool.shutdown(cancel_futures=True)
     # 关闭连接
     if redis_client:
         try:
-            redis_client.close()
+            await redis_client.aclose()
         except Exception:
             pass
-    if mysql_conn:
+    mysql_pool: aiomysql.Pool = app.state.mysql_pool
+    if mysql_pool:
         try:
-            mysql_conn.close()
+            mysql_pool.close()
+            await mysql_pool.wait_closed()
         except Exception:
             pass
 
-app = FastAPI(lifespan=lifespan)
+class RequestTimeMiddleware:
+    """请求到达时记录一次时间戳，端点通过 request.state.now 读取"""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["now"] = int(time.time())
+        await self.app(scope, receive, send)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=OrjsonResponse)
+# 行情表格的 JSON 重复度高，压缩后体积通常只有原来的几分之一
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+app.add_middleware(RequestTimeMiddleware)
+
+
+# ============================ 响应缓存 ============================
+_CACHE_KEY_TYPES = (str, int, float, bool, type(None))
+_CACHED_MEDIA_TYPES: Final = frozenset({"application/json", ARROW_MEDIA_TYPE})
+
+
+def _period_ttl(params: dict[str, Any]) -> int:
+    # 分钟线缓存 60s，日/周/月线等缓存 3600s
+    return 60 if params["period"].endswith("min") else 3600
+
+
+async def single_flight(key: str, func: Callable[..., Response], **kwargs: Any) -> Response:
+    """相同 key 的并发请求只触发一次爬取，其余请求等待同一个结果"""
+    inflight: dict[str, asyncio.Future] = app.state.inflight
+    future = inflight.get(key)
+    if future is None:
+        # 与普通 def 端点共用 anyio 线程池 (默认 40 线程)，而非 asyncio 默认执行器
+        future = asyncio.ensure_future(run_in_threadpool(partial(func, **kwargs)))
+        inflight[key] = future
+        future.add_done_callback(lambda _: inflight.pop(key, None))
+    # shield: 某个客户端断开时不取消其他请求共享的爬取
+    return await asyncio.shield(future)
+
+
+def conditional_response(
+    request: Request | None,
+    body: bytes,
+    media_type: str,
+    max_age: int,
+    private: bool = False
+) -> Response:
+    """
+    附带 ETag 与 Cache-Control，If-None-Match 命中时返回 304
+    同一 URL 按 Accept 返回 JSON / Arrow / NDJSON，因此带上 Vary: Accept；
+    private=True (携带用户凭证的请求) 时不允许共享缓存保存
+    """
+    opaque = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    etag = f"W/{opaque}"
+    scope = "private" if private else "public"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"{scope}, max-age={max_age}",
+        "Vary": "Accept"
+    }
+    if request:
+        # If-None-Match 使用弱比较: 忽略双方的 W/ 前缀，* 匹配任意表示
+        tags = {tag.strip().removeprefix("W/")
+                for tag in request.headers.get("if-none-match", "").split(",")}
+        if opaque in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def redis_cache(
+    prefix: str,
+    ttl: int | Callable[[dict[str, Any]], int],
+    stream: bool = False,
+    cursor_fields: tuple[str, ...] = ()
+):
+    """
+    将端点序列化后的响应体 (JSON 或 Arrow) 缓存到 Redis，key 为 findev:{prefix}:{sha1(参数)}
+    未命中时经 single_flight 在线程池中执行爬虫，Redis 不可用时直接透传
+    stream=True 的端点在请求 NDJSON 时直接流式返回，不经缓存与共享
+    cursor_fields 非空时先将 cursor 按这些参数校验并解析为 index，
+    ?cursor=X 与等价的 ?index=N 共用同一缓存
+    响应带有 ETag 与 Cache-Control (max-age 不超过缓存剩余寿命)，浏览器 / CDN 可直接复用
+    """
+    def decorator(func: Callable[..., Response]):
+        @wraps(func)
+        async def wrapper(**kwargs: Any) -> Response:
+            if cursor_fields and kwargs.get("cursor") is not None:
+                query = {k: kwargs.get(k) for k in cursor_fields}
+                kwargs["index"] = decode_cursor(kwargs["cursor"], query)
+                kwargs["cursor"] = None
+            params = {
+                k: v for k, v in kwargs.items() if isinstance(v, _CACHE_KEY_TYPES)
+            }
+            request: Request | None = kwargs.get("request")
+            if stream and request and accepts_ndjson(request):
+                return await run_in_threadpool(func, **kwargs)
+            # 按 Accept 区分缓存 key，实际的 Content-Type 以端点返回为准
+            params["accept"] = (
+                ARROW_MEDIA_TYPE if request and accepts_arrow(request)
+                else "application/json"
+            )
+            digest = hashlib.sha1(
+                orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+            key = f"findev:{prefix}:{digest}"
+            expire = ttl(params) if callable(ttl) else ttl
+            redis_client: aioredis.Redis = app.state.redis_client
+            cached = None
+            max_age = expire
+            if redis_client:
+                try:
+                    async with redis_client.pipeline(transaction=False) as pipe:
+                        cached, remaining = await pipe.get(key).ttl(key).execute()
+                    # 命中时 max-age 取缓存剩余寿命，避免客户端再叠加一个完整 TTL
+                    if cached is not None and remaining > 0:
+                        max_age = remaining
+                except Exception:
+                    pass
+            if cached is not None:
+                # 缓存值为 "<media_type>\n<body>"
+                cached_type, _, body = cached.partition(b"\n")
+                media_type = cached_type.decode(errors="replace")
+            if cached is None or media_type not in _CACHED_MEDIA_TYPES:
+                response = await single_flight(key, func, **kwargs)
+                if response.status_code != 200:
+                    return response
+                body, media_type = response.body, response.media_type
+                max_age = expire
+                if redis_client:
+                    try:
+                        await redis_client.setex(
+                            key, expire, media_type.encode() + b"\n" + body)
+                    except Exception:
+                        pass
+            return conditional_response(
+                request, body, media_type, max_age,
+                private=params.get("authorization") is not None
+            )
+        return wrapper
+    return decorator
 
 
 # ============================ 定义 API ============================
-def get_services(request: Request) -> tuple[redis.Redis, mysql.connector.MySQLConnection]:
-    return request.app.state.redis_client, request.app.state.mysql_conn
+_HEALTH_TTL: Final = 1.0  # 秒
+_THEME_DETAIL_MAX_PAGESIZE: Final = 1201
+# theme_detail 游标绑定的查询参数，authorization 不写入游标
+_THEME_DETAIL_CURSOR_FIELDS: Final = ("id", "date", "pagesize", "sort_by", "ascending")
+# 静态响应在导入时编码一次
+_ROOT_BODY: Final = orjson.dumps(
+    {"message": "Hello, World! This is FinDev-Backend."})
+_VERSION_BODY: Final = orjson.dumps({
+    "service": "FinDev-Backend",
+    "version": "0.1.0",
+    "ashare_core": "v1.0.6",
+})
 
 
-def get_session_manager(request: Request) -> SessionManager:
-    return request.app.state.session_manager
+@app.get("/")
+async def read_root() -> Response:
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/")
-def read_root() -> dict[str, str]:
-    return {"message": "Hello, World! This is FinDev-Backend."}
+async def ping_redis(redis_client: aioredis.Redis | None) -> bool:
+    if not redis_client:
+        return False
+    try:
+        await redis_client.ping()
+        return True
+    except Exception:
+        return False
+
+
+async def ping_mysql(mysql_pool: aiomysql.Pool | None) -> bool:
+    if not mysql_pool:
+        return False
+    try:
+        async with mysql_pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT 1")
+                return await cursor.fetchone() == (1,)
+    except Exception:
+        return False
 
 
 @app.get("/health")
-def health_check(services=Depends(get_services)) -> dict[str, Any]:
-    redis_client, mysql_conn = services
-    redis_client: redis.Redis
-    mysql_conn: mysql.connector.MySQLConnection
-    redis_ok = False
-    mysql_ok = False
-    # 检查 Redis
-    if redis_client:
-        try:
-            redis_client.ping()
-            redis_ok = True
-        except Exception:
-            pass
-    # 检查 MySQL
-    if mysql_conn:
-        try:
-            mysql_ok = mysql_conn.is_connected()
-        except Exception:
-            pass
+async def health_check(request: Request) -> dict[str, Any]:
+    # 探活结果缓存 _HEALTH_TTL 秒，高频探针不会每次都访问 Redis / MySQL
+    health_cache: dict[str, Any] = request.app.state.health_cache
+    now = time.monotonic()
+    if now - health_cache["ts"] >= _HEALTH_TTL:
+        redis_ok, mysql_ok = await asyncio.gather(
+            ping_redis(request.app.state.redis_client),
+            ping_mysql(request.app.state.mysql_pool)
+        )
+        health_cache.update(ts=now, redis_ok=redis_ok, mysql_ok=mysql_ok)
+    redis_ok, mysql_ok = health_cache["redis_ok"], health_cache["mysql_ok"]
     return {
         "status": "healthy" if (redis_ok and mysql_ok) else "unhealthy",
         "services": {
@@ -125,262 +596,253 @@ def health_check(services=Depends(get_services)) -> dict[str, Any]:
 
 
 @app.get("/em_guba/stock_history_rank")
+@redis_cache("em_guba:stock_history_rank", ttl=3600)
 def crawl_em_stock_history_rank(
+    request: Request,
     symbol: str,
-    type: Literal['120d', '0.5y', '1y', '1ly'] = "1y",
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    type: Literal['120d', '0.5y', '1y', '1ly'] = "1y"
+) -> Response:
+    session = crawler_session(request, "em_guba")
     data = em_web.stock_history_rank(
         symbol,
         type=type,
-        session=session.create_or_get("em_guba", "Session", use_http=False)
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "symbol": symbol,
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        symbol=symbol,
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/ths_app/plate_stats")
+@redis_cache("ths_app:plate_stats", ttl=60)
 def crawl_ths_plate_stats(
+    request: Request,
     type: Literal['concept', 'industry', 'region', 'style'] | None = None,
     index: int = 0,
-    pagesize: int = 10,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
-    type_map = {
-        'concept': '概念',
-        'industry': '行业',
-        'region': '地域',
-        'style': '风格'
-    }
+    pagesize: int = 10
+) -> Response:
+    session = crawler_session(request, "ths_app")
     data = ths_app.plateStats(
-        type_map.get(type),
+        _PLATE_TYPE_MAP.get(type),
         index=index,
         pagesize=pagesize,
-        session=session.create_or_get("ths_app", "Session")
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/ths_l2/hot_plate_circle")
+@redis_cache("ths_l2:hot_plate_circle", ttl=3600)
 def crawl_ths_hot_plate_circle(
+    request: Request,
     days: Literal[10, 30] = 30,
-    type: Literal['industry', 'concept'] | None = None,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    type: Literal['industry', 'concept'] | None = None
+) -> Response:
+    session = crawler_session(request, "ths_l2")
     name_df, code_df, rank_df = ths_app.l2_hotPlateCircle(
         days=days,
         type=type,
-        session=session.create_or_get("ths_l2", "Session")
+        session=session
     )
-    return {
-        "result": {
-            "name": name_df.to_dict("split"),
-            "code": code_df.to_dict("split"),
-            "rank": rank_df.to_dict("split")
+    return MsgspecResponse(CrawlResponse(
+        result={
+            "name": df_to_split(name_df),
+            "code": df_to_split(code_df),
+            "rank": df_to_split(rank_df)
         },
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/ths_web/stock")
+@redis_cache("ths_web:stock", ttl=_period_ttl)
 def crawl_ths_stock(
+    request: Request,
     symbol: str,
     period: Literal[
         'daily', 'weekly', 'monthly', 'quarterly', 'yearly',
         '1min', '5min', '30min', '60min', '240min'
     ] = 'daily',
     adjust: Literal['bfq', 'qfq', 'hfq'] = 'qfq',
-    size: int = 250,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
-    period_map = {
-        'daily': '日线',
-        'weekly': '周线',
-        'monthly': '月线',
-        'quarterly': '季线',
-        'yearly': '年线',
-        '1min': '1分钟线',
-        '5min': '5分钟线',
-        '30min': '30分钟线',
-        '60min': '60分钟线',
-        '240min': '240分钟线'
-    }
-    fq_map = {
-        'bfq': '不复权',
-        'qfq': '前复权',
-        'hfq': '后复权'
-    }
+    size: int = 250
+) -> Response:
+    session = crawler_session(request, "ths_web")
     data = ths_web.ths_stock(
         symbol,
-        period=period_map.get(period),
-        adjust=fq_map.get(adjust),
+        period=_PERIOD_MAP.get(period),
+        adjust=_FQ_MAP.get(adjust),
         size=size,
-        session=session.create_or_get("ths_web", "Session")
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "symbol": symbol,
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        symbol=symbol,
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/em_web/stock")
+@redis_cache("em_web:stock", ttl=_period_ttl)
 def crawl_em_stock(
+    request: Request,
     symbol: str,
     period: Literal[
         'daily', 'weekly', 'monthly', '1min', '5min', '30min', '60min', '240min'
     ] = 'daily',
     adjust: Literal['bfq', 'qfq', 'hfq'] = 'qfq',
     start_date: str = "1970-01-01",
-    end_date: str = "2050-01-01",
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
-    period_map = {
-        'daily': '日线',
-        'weekly': '周线',
-        'monthly': '月线',
-        'quarterly': '季线',
-        'yearly': '年线',
-        '1min': '1分钟线',
-        '5min': '5分钟线',
-        '30min': '30分钟线',
-        '60min': '60分钟线',
-        '240min': '240分钟线'
-    }
-    fq_map = {
-        'bfq': '不复权',
-        'qfq': '前复权',
-        'hfq': '后复权'
-    }
+    end_date: str = "2050-01-01"
+) -> Response:
+    session = crawler_session(request, "em_web")
     data = em_web.em_stock(
         symbol,
-        period=period_map.get(period),
-        adjust=fq_map.get(adjust),
+        period=_PERIOD_MAP.get(period),
+        adjust=_FQ_MAP.get(adjust),
         start_date=start_date,
         end_date=end_date,
-        session=session.create_or_get("em_web", "Session")
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "symbol": symbol,
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        symbol=symbol,
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/jygs_web/companies")
+@redis_cache("jygs_web:companies", ttl=3600)
 def crawl_jygs_companies(
+    request: Request,
     keyword: str = None,
-    pagesize: int = 50,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    pagesize: int = 50
+) -> Response:
+    session = crawler_session(request, "jygs_web")
     data = jygs_web.get_companies(
         keyword=keyword,
         pagesize=pagesize,
-        session=session.create_or_get("jygs_web", "Session", use_http=False)
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/jygs_web/announcement")
+@redis_cache("jygs_web:announcement", ttl=60)
 def crawl_jygs_announcement(
+    request: Request,
     keyword: str = None,
-    pagesize: int = 50,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    pagesize: int = 50
+) -> Response:
+    session = crawler_session(request, "jygs_web")
     data = jygs_web.announcement(
         keyword=keyword,
         pagesize=pagesize,
-        session=session.create_or_get("jygs_web", "Session", use_http=False)
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/jygs_web/industry")
+@redis_cache("jygs_web:industry", ttl=3600)
 def crawl_jygs_industry(
+    request: Request,
     keyword: str = None,
-    pagesize: int = 50,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    pagesize: int = 50
+) -> Response:
+    session = crawler_session(request, "jygs_web")
     data = jygs_web.industry(
         keyword=keyword,
         pagesize=pagesize,
-        session=session.create_or_get("jygs_web", "Session", use_http=False)
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/jyhf_app/theme_list")
+@redis_cache("jyhf_app:theme_list", ttl=60)
 def crawl_jyhf_theme(
+    request: Request,
     sort_by: str = "pctChg",
     ascending: bool = False,
-    authorization: str = None,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    authorization: str = None
+) -> Response:
+    session = crawler_session(request, "jyhf_app")
     data = jyhf_app.themeList(
         sort_by=sort_by,
         ascending=ascending,
         authorization=authorization,
-        session=session.create_or_get("jyhf_app", "Session", use_http=False)
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        size=data.shape[0],
+        status="success",
+        timestamp=request.state.now
+    ))
 
 
 @app.get("/jyhf_app/theme_detail")
+@redis_cache(
+    "jyhf_app:theme_detail", ttl=60, stream=True,
+    cursor_fields=_THEME_DETAIL_CURSOR_FIELDS
+)
 def crawl_jyhf_theme_detail(
+    request: Request,
     id: str,
     date: str = None,
     index: int = 0,
-    pagesize: int = 1201,
+    pagesize: Annotated[int, Query(ge=1, le=_THEME_DETAIL_MAX_PAGESIZE)] = 50,
+    cursor: str | None = None,
     sort_by: str = "pctChg",
     ascending: bool = False,
-    authorization: str = None,
-    session=Depends(get_session_manager)
-) -> dict[str, Any]:
-    session: SessionManager
+    authorization: str = None
+) -> Response:
+    # cursor 取自上一页响应的 next_cursor，已由 redis_cache 校验并解析为 index
+    session = crawler_session(request, "jyhf_app_json")
     data = jyhf_app.themeStockPerformance(
         theme_id=id,
         date=date,
@@ -389,22 +851,50 @@ def crawl_jyhf_theme_detail(
         sort_by=sort_by,
         ascending=ascending,
         authorization=authorization,
-        session=session.create_or_get(
-            "jyhf_app", "Session", use_http=False, check="json")
+        session=session
     )
-    return {
-        "result": data.to_dict("split"),
-        "id": id,
-        "size": data.shape[0],
-        "status": "success",
-        "timestamp": int(time.time())
-    }
+    if accepts_arrow(request):
+        return arrow_response(request, data)
+    if accepts_ndjson(request):
+        return ndjson_response(data)
+    return MsgspecResponse(CrawlResponse(
+        result=df_to_split(data),
+        id=id,
+        size=data.shape[0],
+        # 取满一页说明可能还有下一页
+        next_cursor=encode_cursor(index + 1, {
+            "id": id, "date": date, "pagesize": pagesize,
+            "sort_by": sort_by, "ascending": ascending
+        }) if data.shape[0] >= pagesize else None,
+        status="success",
+        timestamp=request.state.now
+    ))
+
+
+@app.get("/jyhf_app/theme_detail/stream")
+def crawl_jyhf_theme_detail_stream(
+    request: Request,
+    id: str,
+    date: str = None,
+    sort_by: str = "pctChg",
+    ascending: bool = False,
+    authorization: str = None
+) -> StreamingResponse:
+    """一次取回全部成分股，以 NDJSON 流式返回"""
+    session = crawler_session(request, "jyhf_app_json")
+    data = jyhf_app.themeStockPerformance(
+        theme_id=id,
+        date=date,
+        index=0,
+        pagesize=_THEME_DETAIL_MAX_PAGESIZE,
+        sort_by=sort_by,
+        ascending=ascending,
+        authorization=authorization,
+        session=session
+    )
+    return ndjson_response(data)
 
 
 @app.get("/version")
-def get_version() -> dict[str, str]:
-    return {
-        "service": "FinDev-Backend",
-        "version": "0.1.0",
-        "ashare_core": "v1.0.6",
-    }
+async def get_version() -> Response:
+    return Response(content=_VERSION_BODY, media_type="application/json")